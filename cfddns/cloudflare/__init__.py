@@ -0,0 +1,8 @@
+from .api import (
+    CloudflareAPI,
+    IPInfo,
+    InvalidAPITokenError,
+    TokenVerificationError,
+    UpdateResult,
+    init_cloudflare_api,
+)
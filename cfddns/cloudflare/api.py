@@ -1,12 +1,65 @@
+import functools
 import logging
+import os
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, Any, Optional
+from pathlib import Path
+from typing import Dict, Any, NamedTuple, Optional
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Initialize the logger
 logger = logging.getLogger(__name__)
 
+# How long a cached zone name is trusted before it is fetched again
+ZONE_NAME_CACHE_MAX_AGE = 7 * 24 * 60 * 60
+
+# Batch endpoint responses meaning the batch itself was rejected, in which case
+# the records are sent one at a time instead
+BATCH_REJECTED_STATUS_CODES = frozenset([400, 404, 405, 422])
+
+
+def _decode_json(response: requests.Response) -> Any:
+    # Prefer orjson when it is installed; it parses large record lists faster
+    if orjson is None:
+        return response.json()
+    try:
+        return orjson.loads(response.content)
+    except orjson.JSONDecodeError as err:
+        raise requests.exceptions.InvalidJSONError(str(err), response=response)
+
+
+def _json_body(payload: Any) -> Dict[str, Any]:
+    # Keyword arguments sending payload as a JSON request body
+    if orjson is None:
+        return {"json": payload}
+    return {
+        "data": orjson.dumps(payload),
+        "headers": {"Content-Type": "application/json"},
+    }
+
+
+class IPInfo(NamedTuple):
+    """A public IP address and the DNS record type it belongs in."""
+
+    address: str
+    type: str  # 'A' or 'AAAA'
+
+
+class UpdateResult(NamedTuple):
+    """The outcome of updating a set of DNS records."""
+
+    changed: int  # Records updated or created
+    failed: int  # Records that could not be checked or written
+
 
 class TokenVerificationError(Exception):
     pass
@@ -22,8 +75,27 @@ class CloudflareAPI:
         self.config = config
         self.session = requests.Session()
         self.zone_id = self.config["zone_id"]
+        self._zone_url = f"{self.url}/zones/{self.zone_id}"
+        self._records_url = f"{self._zone_url}/dns_records"
+        self._records_cache: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._last_state: Dict[tuple[str, str], tuple[str, bool, int]] = {}
+        self._base_domain_name: Optional[str] = None
+        self.token_valid: Optional[bool] = None
+        self._mount_http_adapter()
         self._set_session_headers()
-        self._get_base_domain_name()
+
+    def _mount_http_adapter(self):
+        # Pool connections to the API and retry transient failures. POST is
+        # left out of the retried methods since it is not idempotent.
+        retries = Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset(["GET", "PATCH", "PUT"]),
+        )
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=retries)
+        self.session.mount("https://", adapter)
+        self.session.headers["Connection"] = "keep-alive"
 
     def _set_session_headers(self):
         api_token = self.config["auth"]["api_token"]
@@ -35,54 +107,95 @@ class CloudflareAPI:
 
         self.session.headers.update({"Authorization": "Bearer " + api_token})
 
+    def _ensure_verified(self) -> None:
+        # The token is only verified explicitly once a request is rejected
+        if self.token_valid is None:
+            try:
+                self.token_valid = self._verify_token()
+            except TokenVerificationError as err:
+                logger.error("%s", str(err))
+                sys.exit(1)
+
+    @staticmethod
+    def _get_cache_dir() -> Path:
+        # Path.home() raises RuntimeError if no home directory can be found
+        cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+        return Path(cache_home) / "cfddns"
+
+    def _get_zone_name_cache_path(self) -> Path:
+        return self._get_cache_dir() / f"zone_{self.zone_id}.name"
+
+    @property
+    def base_domain_name_known(self) -> bool:
+        """Whether the zone name has already been looked up"""
+        return self._base_domain_name is not None
+
+    @property
+    def base_domain_name(self) -> str:
+        # Fetched on first use rather than when the client is created. Raises
+        # RequestException or ValueError if the zone cannot be looked up.
+        if self._base_domain_name is None:
+            self._base_domain_name = self._read_cached_base_domain_name()
+        if self._base_domain_name is None:
+            self._get_base_domain_name()
+            self._write_cached_base_domain_name()
+        return self._base_domain_name
+
+    def _read_cached_base_domain_name(self) -> Optional[str]:
+        # The zone ID -> name mapping is static, so reuse it across runs
         try:
-            self.token_valid = self._verify_token()
-        except TokenVerificationError as err:
-            logger.error("%s", str(err))
-            sys.exit(1)
+            cache_path = self._get_zone_name_cache_path()
+            age = time.time() - cache_path.stat().st_mtime
+            if age > ZONE_NAME_CACHE_MAX_AGE:
+                return None
+            return cache_path.read_text(encoding="utf-8").strip() or None
+        except (OSError, RuntimeError):
+            return None
 
-    def _get_base_domain_name(self):
+    def _write_cached_base_domain_name(self) -> None:
+        try:
+            cache_path = self._get_zone_name_cache_path()
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            cache_path.write_text(self._base_domain_name, encoding="utf-8")
+        except (OSError, RuntimeError) as err:
+            logger.debug("Could not cache base domain name: %s", str(err))
+
+    def _get_base_domain_name(self) -> None:
         # Fetch base domain name from Cloudflare API
         try:
-            response = self.session.get(f"{self.url}/zones/{self.zone_id}")
+            response = self.session.get(self._zone_url, timeout=10)
             response.raise_for_status()
         except requests.exceptions.RequestException as err:
-            logger.error("Failed to fetch base domain name: %s", str(err))
-            sys.exit(1)
+            if err.response is not None and err.response.status_code in (401, 403):
+                # Exits if the token itself is invalid
+                self._ensure_verified()
+            raise
+
+        # A successful authenticated request implies a valid token
+        self.token_valid = True
 
         try:
-            self.base_domain_name = response.json()["result"]["name"]
+            self._base_domain_name = _decode_json(response)["result"]["name"]
         except (KeyError, TypeError) as err:
-            logger.error(
-                "Invalid response format. Could not extract base domain name: %s",
-                str(err),
-            )
-            sys.exit(1)
-
-        return self.base_domain_name
+            raise ValueError(
+                f"Invalid response format. Could not extract base domain name: {err}"
+            ) from err
 
-    def _get_fqdn(self, subdomain: str) -> str:
+    @staticmethod
+    @functools.lru_cache(maxsize=512)
+    def _get_fqdn(subdomain: str, base_domain_name: str) -> str:
         # Normalize the subdomain
         name = subdomain.lower().strip()
 
-        # Handle different subdomain formats
-        if name == self.base_domain_name:
-            # It's the base domain
-            fqdn = self.base_domain_name
-        elif name.endswith(f".{self.base_domain_name}"):
-            # It's a subdomain with the base domain
-            fqdn = name
-        elif "." in name:
-            # It's a multi-level subdomain
-            fqdn = f"{name}.{self.base_domain_name}"
-        else:
-            # It's a single-word subdomain
-            fqdn = f"{name}.{self.base_domain_name}"
-
-        return fqdn
+        # The base domain itself, or a name that already ends with it
+        if name == base_domain_name or name.endswith(f".{base_domain_name}"):
+            return sys.intern(name)
+
+        # A single or multi-level subdomain relative to the base domain
+        return sys.intern(f"{name}.{base_domain_name}")
 
     def _verify_token(self) -> bool:
-        url = "https://api.cloudflare.com/client/v4/user/tokens/verify"
+        url = f"{self.url}/user/tokens/verify"
         try:
             response = self.session.get(url=url, timeout=10)
             response.raise_for_status()
@@ -90,28 +203,136 @@ class CloudflareAPI:
         except requests.exceptions.RequestException as err:
             raise TokenVerificationError(f"API token validation failed: {err}")
 
-    def get_dns_records(self, record_type) -> Optional[Dict[str, Any]]:
+    def update_config(self, config: dict) -> None:
+        """Swap in a reloaded configuration with the same credentials and zone"""
+        self.config = config
+
+    def close(self) -> None:
+        """Close the HTTP session and its pooled connections"""
+        self.session.close()
+
+    def forget_known_state(self) -> None:
+        """Forget which records are known to be current, forcing a full check"""
+        self._last_state.clear()
+
+    def clear_cache(self) -> None:
+        """Forget DNS records fetched during the previous update cycle"""
+        self._records_cache.clear()
+
+    def get_dns_records(self, record_type) -> Optional[Dict[str, Dict[str, Any]]]:
+        """Return the existing DNS records of a given type, keyed by name"""
+        # Reuse the records fetched earlier in this update cycle
+        if record_type in self._records_cache:
+            return self._records_cache[record_type]
+
+        dns_records = self._fetch_dns_records(record_type)
+        if dns_records is None:
+            return None
+
+        # Names are interned so lookups by fqdn can match on identity
+        records = {
+            sys.intern(record["name"]): record for record in dns_records["result"]
+        }
+        self._records_cache[record_type] = records
+        return records
 
+    def _fetch_dns_records(self, record_type) -> Optional[Dict[str, Any]]:
         try:
             response = self.session.get(
-                f"{self.url}/zones/{self.zone_id}/dns_records?per_page=100&type={record_type}"
+                self._records_url,
+                params={"per_page": 100, "type": record_type},
+                timeout=10,
             )
             response.raise_for_status()
-            return response.json()
+            return _decode_json(response)
         except requests.exceptions.RequestException as err:
+            status_code = err.response.status_code if err.response is not None else None
+            if status_code in (401, 403):
+                self._ensure_verified()
+            elif status_code == 404:
+                # The zone may have moved; look its name up again next time
+                self._base_domain_name = None
+                try:
+                    self._get_zone_name_cache_path().unlink(missing_ok=True)
+                except (OSError, RuntimeError):
+                    pass
             logger.error("Error getting DNS record: %s", str(err))
             return None
 
-    def _needs_update(self, record, proxied, ttl, ip_data) -> tuple[bool, bool, bool]:
-        """Check if a DNS record needs to be updated"""
-        update_content = record["content"] != ip_data["address"]
-        update_proxied = record["proxied"] != proxied
-        # Check if the TTL needs to be updated (only if not proxied)
-        update_ttl = not record["proxied"] and record["ttl"] != ttl
-        return update_content, update_proxied, update_ttl
+    @staticmethod
+    def _validate_ip_data(ip_data: IPInfo) -> None:
+        if not isinstance(ip_data, IPInfo):
+            raise ValueError("Invalid IP data format")
+
+    def _is_known_current(
+        self, fqdn: str, proxied: bool, ttl: int, ip_data: IPInfo
+    ) -> bool:
+        """Check if a record was last seen or written with the same values"""
+        state = self._last_state.get((fqdn, ip_data.type))
+        if state != (ip_data.address, proxied, ttl):
+            return False
+
+        logger.info(
+            "DNS record %s with address %s already up-to-date.",
+            fqdn,
+            ip_data.address,
+        )
+        return True
+
+    def _remember_state(
+        self, fqdn: str, proxied: bool, ttl: int, ip_data: IPInfo
+    ) -> None:
+        self._last_state[(fqdn, ip_data.type)] = (ip_data.address, proxied, ttl)
+
+    def _update_payload(
+        self,
+        record: dict,
+        fqdn: str,
+        proxied: bool,
+        ttl: int,
+        ip_data: IPInfo,
+        timestamp: str,
+    ) -> Optional[Dict[str, Any]]:
+        """Build a partial payload for an existing record, or None if up-to-date"""
+        desired = {
+            "content": ip_data.address,
+            "proxied": proxied,
+            # The TTL of proxied records is managed by Cloudflare
+            "ttl": record["ttl"] if proxied else ttl,
+        }
+        changes = {key: value for key, value in desired.items() if record[key] != value}
+
+        if not changes:
+            logger.info(
+                "DNS record %s with address %s already up-to-date.",
+                fqdn,
+                ip_data.address,
+            )
+            return None
+
+        logger.info("Updating record for %s", fqdn)
+        return {
+            "id": record["id"],
+            **changes,
+            "comment": f"Updated by cffdns @{timestamp}",
+        }
+
+    def _create_payload(
+        self, fqdn: str, proxied: bool, ttl: int, ip_data: IPInfo, timestamp: str
+    ) -> Dict[str, Any]:
+        """Build the payload for a new record"""
+        logger.info("Creating new record for %s", fqdn)
+        return {
+            "type": ip_data.type,
+            "name": fqdn,
+            "content": ip_data.address,
+            "proxied": proxied,
+            "ttl": ttl,
+            "comment": f"Created by cffdns @{timestamp}",
+        }
 
     def update_dns_record(
-        self, subdomain: str, proxied: bool, ttl: int, ip_data: dict
+        self, subdomain: str, proxied: bool, ttl: int, ip_data: IPInfo
     ) -> bool:
         """
         Update DNS record for a given subdomain.
@@ -120,95 +341,126 @@ class CloudflareAPI:
             subdomain (str): The subdomain to update.
             proxied (bool): Whether the record is proxied.
             ttl (int): Time to live for the DNS record.
-            ip_data (dict): IP data containing 'address' and 'type'.
+            ip_data (IPInfo): The IP address and its record type.
 
         Returns:
             bool: True if the record was updated or created, False otherwise.
         """
-        # Validate input
-        if (
-            not isinstance(ip_data, dict)
-            or "address" not in ip_data
-            or "type" not in ip_data
-        ):
-            raise ValueError("Invalid IP data format")
+        result = self.update_dns_records([(subdomain, proxied, ttl, ip_data)])
+        return result.changed > 0
 
-        # Create fully qualified domain name
-        fqdn = self._get_fqdn(subdomain)
-
-        # Retrieve existing DNS records
-        dns_records = self.get_dns_records(record_type=ip_data["type"])
-
-        if dns_records is not None:
-            for record in dns_records["result"]:
-                if record["name"] == fqdn:
-                    # Check if any existing record should be updated
-                    update_content, update_proxied, update_ttl = self._needs_update(
-                        record, proxied, ttl, ip_data
-                    )
-
-                    if any([update_content, update_proxied, update_ttl]):
-                        logger.info("Updating record for %s", str(record["name"]))
-                        identifier = record["id"]
-                        # Create payload for DNS update
-                        payload = {
-                            "type": ip_data["type"],
-                            "name": fqdn,
-                            "content": (
-                                ip_data["address"]
-                                if update_content
-                                else record["content"]
-                            ),
-                            "proxied": proxied if update_proxied else record["proxied"],
-                            "ttl": ttl if update_ttl else record["ttl"],
-                            "comment": f"Updated by cffdns @{datetime.now().strftime("%Y-%m-%dT%H:%M:%S")}",
-                        }
-                        try:
-                            response = self.session.patch(
-                                f"{self.url}/zones/{self.zone_id}/dns_records/{identifier}",
-                                json=payload,
-                                timeout=10,
-                            )
-                            response.raise_for_status()
-                            return True
-                        except requests.exceptions.RequestException as err:
-                            logger.error(
-                                "Failed to update DNS record for %s: %s", fqdn, str(err)
-                            )
-                            return False
-                    else:
-                        logger.info(
-                            "DNS record %s with address %s already up-to-date.",
-                            fqdn,
-                            ip_data["address"],
-                        )
-                    return False  # Exit after processing the matching record
-
-            # If no existing record matched, create a new DNS record
-            logger.info("Creating new record for %s", fqdn)
-            payload = {
-                "type": ip_data["type"],
-                "name": fqdn,
-                "content": ip_data["address"],
-                "proxied": proxied,
-                "ttl": ttl,
-                "comment": f"Created by cffdns @{datetime.now().strftime("%Y-%m-%dT%H:%M:%S")}",
-            }
-            try:
+    def _send_record(self, fqdn: str, payload: Dict[str, Any]) -> bool:
+        """Update the record identified in payload, or create it if there is no id"""
+        payload = dict(payload)
+        identifier = payload.pop("id", None)
+        try:
+            if identifier is None:
                 response = self.session.post(
-                    f"{self.url}/zones/{self.zone_id}/dns_records",
-                    json=payload,
+                    self._records_url, **_json_body(payload), timeout=10
+                )
+            else:
+                response = self.session.patch(
+                    f"{self._records_url}/{identifier}",
+                    **_json_body(payload),
                     timeout=10,
                 )
-                response.raise_for_status()
-                return True
-            except requests.exceptions.RequestException as err:
-                logger.error("Failed to create DNS record for %s: %s", fqdn, str(err))
-                return False
-        else:
-            logger.info("No existing DNS records found for type %s", ip_data["type"])
+            response.raise_for_status()
+            return True
+        except requests.exceptions.RequestException as err:
+            action = "create" if identifier is None else "update"
+            logger.error("Failed to %s DNS record for %s: %s", action, fqdn, str(err))
             return False
 
+    def update_dns_records(self, updates: list) -> UpdateResult:
+        """
+        Update DNS records for several subdomains with a single batch request.
+
+        Existing records are fetched once per record type and diffed locally;
+        all resulting changes are sent to the zone's batch endpoint at once.
+        If the batch endpoint rejects the batch itself, the changes are sent
+        one record at a time. Other failures are left for the next run.
+
+        Args:
+            updates (list): Tuples of (subdomain, proxied, ttl, ip_data).
+
+        Returns:
+            UpdateResult: The number of records updated or created, and the
+                number of records that could not be checked or written.
+        """
+        states = []
+        payloads = []
+        failed = 0
+        timestamp = datetime.now().strftime("%Y-%m-%dT%H:%M:%S")
+
+        for subdomain, proxied, ttl, ip_data in updates:
+            self._validate_ip_data(ip_data)
+            fqdn = self._get_fqdn(subdomain, self.base_domain_name)
+
+            if self._is_known_current(fqdn, proxied, ttl, ip_data):
+                continue
+
+            record_type = ip_data.type
+            dns_records = self.get_dns_records(record_type=record_type)
+
+            if dns_records is None:
+                logger.info("No existing DNS records found for type %s", record_type)
+                failed += 1
+                continue
+
+            record = dns_records.get(fqdn)
+            if record is not None:
+                payload = self._update_payload(
+                    record, fqdn, proxied, ttl, ip_data, timestamp
+                )
+                if payload is None:
+                    self._remember_state(fqdn, proxied, ttl, ip_data)
+                    continue
+            else:
+                payload = self._create_payload(fqdn, proxied, ttl, ip_data, timestamp)
+            states.append((fqdn, proxied, ttl, ip_data))
+            payloads.append(payload)
+
+        if not payloads:
+            return UpdateResult(0, failed)
+
+        try:
+            response = self.session.post(
+                f"{self._records_url}/batch",
+                **_json_body(
+                    {
+                        "patches": [p for p in payloads if "id" in p],
+                        "posts": [p for p in payloads if "id" not in p],
+                    }
+                ),
+                timeout=10,
+            )
+            response.raise_for_status()
+            applied = [True] * len(payloads)
+        except requests.exceptions.RequestException as err:
+            status_code = err.response.status_code if err.response is not None else None
+            if status_code in (401, 403):
+                self._ensure_verified()
+            if status_code not in BATCH_REJECTED_STATUS_CODES:
+                # The batch may or may not have been applied, or the API is
+                # rate limiting or failing; single requests would only add load
+                logger.error("Failed to send DNS record batch: %s", str(err))
+                return UpdateResult(0, failed + len(payloads))
+            logger.warning(
+                "Failed to apply DNS record batch, updating records one by one: %s",
+                str(err),
+            )
+            fqdns = [state[0] for state in states]
+            with ThreadPoolExecutor(max_workers=min(10, len(payloads))) as executor:
+                applied = list(executor.map(self._send_record, fqdns, payloads))
+
+        for (fqdn, proxied, ttl, ip_data), success in zip(states, applied):
+            if success:
+                self._records_cache.pop(ip_data.type, None)
+                self._remember_state(fqdn, proxied, ttl, ip_data)
+
+        changed = sum(applied)
+        return UpdateResult(changed, failed + len(payloads) - changed)
+
 
 def init_cloudflare_api(config: dict) -> Optional[CloudflareAPI]:
     try:
@@ -1,39 +1,155 @@
 import argparse
+import copy
+import functools
 import hashlib
 import ipaddress
+import json
 import logging
+import re
 import signal
+import socket
+import string
 import sys
+import threading
 import time
+import tomllib
 import requests
 import yaml
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, Optional
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+
+from cfddns.cloudflare import CloudflareAPI, IPInfo, init_cloudflare_api
+
+# Use the libyaml-based loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as YAMLLoader
+except ImportError:
+    from yaml import SafeLoader as YAMLLoader
+
+# Optional faster JSON parser for configuration files in JSON format
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Optional DNS client used to look up the public IP without an HTTPS request
+try:
+    import dns.exception
+    import dns.rdataclass
+    import dns.resolver
+except ImportError:
+    dns = None
+
+# Optional file watcher that picks up configuration changes immediately
+try:
+    from watchdog.observers import Observer
+except ImportError:
+    Observer = None
 
-from cfddns.cloudflare.api import CloudflareAPI, init_cloudflare_api
+logger = logging.getLogger(__name__)
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO, format="%(asctime)s | %(levelname)s | %(message)s"
+# Number of interval runs after which all records are checked against
+# Cloudflare, even if the public IP has not changed
+FULL_SYNC_EVERY = 10
+
+# Set by SIGHUP or the config file watcher to wake the main loop and reload
+# the configuration
+reload_event = threading.Event()
+
+# Set by SIGINT or SIGTERM, together with reload_event to wake the main loop,
+# to stop the loop after the current update
+shutdown_event = threading.Event()
+
+# Write end of the socket the signal numbers are passed through, see
+# signal_catch_setup()
+_signal_wakeup_socket: Optional[socket.socket] = None
+
+# Characters accepted in subdomain names, including '_' for service records
+# and '*' for wildcards
+_SUBDOMAIN_CHARS = frozenset(string.ascii_letters + string.digits + ".-_*")
+
+# Matches the 'ip=<address>' line of the Cloudflare trace response. Only
+# characters of IPv4 and IPv6 literals are accepted.
+_TRACE_IP_RE = re.compile(rb"^ip=([0-9A-Fa-f:.]+)\r?$", re.MULTILINE)
+
+# Session reused by every IP lookup so the connection stays open between polls.
+# Transient failures are retried with backoff before a lookup is given up.
+_ip_session = requests.Session()
+_ip_session.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=2,
+        pool_maxsize=4,
+        max_retries=Retry(
+            total=3, backoff_factor=0.5, status_forcelist=(502, 503, 504)
+        ),
+    ),
 )
-logger = logging.getLogger(__name__)
+_ip_session.headers["Connection"] = "keep-alive"
 
+# Resolver for the 'whoami.cloudflare' lookup, which returns the public IP of
+# the querying machine. Only available when dnspython is installed.
+if dns:
+    _dns_resolver = dns.resolver.Resolver(configure=False)
+    _dns_resolver.nameservers = ["1.1.1.1"]
+    _dns_resolver.lifetime = 5
+else:
+    _dns_resolver = None
 
-def terminate_signal_handler(sig, _frame) -> None:
+
+def terminate_signal_handler(_sig, _frame) -> None:
     """Handles termination signals (SIGINT and SIGTERM)."""
+    # The shutdown is requested by the signal thread, see handle_signal().
+    # Only reading the event is safe here, since that takes no lock.
+    if shutdown_event.is_set():
+        # A second signal exits right away, e.g. while a request hangs
+        sys.exit(0)
+
 
-    signal_names = {signal.SIGTERM: "SIGTERM", signal.SIGINT: "SIGINT"}
+def reload_signal_handler(_sig, _frame) -> None:
+    """Handles the reload signal (SIGHUP)."""
+    # The reload is requested by the signal thread, see handle_signal()
 
-    signal_name = signal_names.get(sig, f"Signal {sig}")
 
-    logger.info("%s received, shutting down", signal_name)
-    sys.exit(0)
+def handle_signal(signum: int) -> None:
+    """Request a reload or a shutdown for a received signal."""
+    if signum == getattr(signal, "SIGHUP", None):
+        logger.info("SIGHUP received, reloading configuration")
+        reload_event.set()
+    elif signum in (signal.SIGTERM, signal.SIGINT):
+        logger.info("%s received, shutting down", signal.Signals(signum).name)
+        shutdown_event.set()
+        reload_event.set()  # Wake the main loop if it is sleeping
+
+
+def _dispatch_signals(reader: socket.socket) -> None:
+    # Each received signal is written to the socket as a single byte
+    while data := reader.recv(64):
+        for signum in data:
+            handle_signal(signum)
 
 
 def signal_catch_setup() -> None:
-    """Set up signal handlers for SIGINT and SIGTERM."""
+    """Set up signal handlers for SIGINT, SIGTERM and SIGHUP."""
+    global _signal_wakeup_socket
+
+    # Setting an Event from a signal handler can deadlock, as the interrupted
+    # main thread may be holding the Event's lock. The signals are passed
+    # through a socket to a thread that sets the events instead.
+    reader, _signal_wakeup_socket = socket.socketpair()
+    _signal_wakeup_socket.setblocking(False)
+    signal.set_wakeup_fd(_signal_wakeup_socket.fileno(), warn_on_full_buffer=False)
+    threading.Thread(
+        target=_dispatch_signals, args=(reader,), name="signals", daemon=True
+    ).start()
+
     signal.signal(signal.SIGTERM, terminate_signal_handler)
     signal.signal(signal.SIGINT, terminate_signal_handler)
+    if hasattr(signal, "SIGHUP"):
+        signal.signal(signal.SIGHUP, reload_signal_handler)
 
 
 def get_version():
@@ -47,33 +163,51 @@ def get_version():
     return version
 
 
-# Define the command-line arguments
-parser = argparse.ArgumentParser(
-    prog="cfddns", description="Cloudflare Dynamic DNS updater"
-)
-parser.add_argument(
-    "config",
-    type=str,
-    help="Path to your config.yaml file",
-)
-parser.add_argument(
-    "-i", "--interval", type=int, help="Interval between loop iterations in seconds"
-)
-parser.add_argument("--version", action="version", version=f"%(prog)s {get_version()}")
+def _build_parser() -> argparse.ArgumentParser:
+    # Define the command-line arguments
+    parser = argparse.ArgumentParser(
+        prog="cfddns", description="Cloudflare Dynamic DNS updater"
+    )
+    parser.add_argument(
+        "config",
+        type=str,
+        help="Path to your config.yaml file",
+    )
+    parser.add_argument(
+        "-i",
+        "--interval",
+        type=int,
+        help="Interval between loop iterations in seconds",
+    )
+    parser.add_argument(
+        "--version", action="version", version=f"%(prog)s {get_version()}"
+    )
+    return parser
+
+
+def _config_error(message: str, *args) -> bool:
+    # Report why a configuration was rejected
+    logger.warning("Invalid configuration: " + message, *args)
+    return False
 
 
 def validate_config(config: Dict) -> bool:
     """
     Verify the structure and content of the configuration dictionary.
+
+    The reason for rejecting a configuration is logged as a warning.
     """
+    if not isinstance(config, dict):
+        return _config_error("expected a mapping at the top level")
+
     # Check if 'auth' section exists and has correct structure
     if "auth" not in config or not isinstance(config["auth"], dict):
-        return False
+        return _config_error("'auth' section is missing or not a mapping")
     auth_section = config["auth"]
 
     # Check if 'api_token' or 'api_key' exists in 'auth' section
     if "api_token" not in auth_section and "api_key" not in auth_section:
-        return False
+        return _config_error("'auth' needs an 'api_token' or 'api_key'")
 
     # If 'api_key' exists, ensure it has 'key' and 'email' keys
     if "api_key" in auth_section:
@@ -83,7 +217,7 @@ def validate_config(config: Dict) -> bool:
             or "key" not in api_key
             or "email" not in api_key
         ):
-            return False
+            return _config_error("'api_key' needs a 'key' and an 'email'")
 
     # Check if 'zone_id' exists and is a non-empty string
     if (
@@ -91,152 +225,417 @@ def validate_config(config: Dict) -> bool:
         or not isinstance(config["zone_id"], str)
         or not config["zone_id"].strip()
     ):
-        return False
+        return _config_error("'zone_id' is missing or empty")
 
     # Check if 'subdomains' section exists and has correct structure
     if "subdomains" not in config or not isinstance(config["subdomains"], dict):
-        return False
+        return _config_error("'subdomains' section is missing or not a mapping")
     subdomains_section = config["subdomains"]
 
     # Validate each subdomain entry
     for subdomain, subdomain_config in subdomains_section.items():
-        if not isinstance(subdomain, str) or not subdomain.strip():
-            return False
+        if (
+            not isinstance(subdomain, str)
+            or not subdomain.strip()
+            or not _SUBDOMAIN_CHARS.issuperset(subdomain.strip())
+        ):
+            return _config_error("subdomain name '%s' is not valid", subdomain)
         if (
             not isinstance(subdomain_config, dict)
             or "proxied" not in subdomain_config
             or "ttl" not in subdomain_config
         ):
-            return False
+            return _config_error("subdomain '%s' needs 'proxied' and 'ttl'", subdomain)
         if not isinstance(subdomain_config["proxied"], bool):
-            return False
+            return _config_error("'proxied' of '%s' must be true or false", subdomain)
         if not isinstance(subdomain_config["ttl"], (str, int)):
-            return False
+            return _config_error(
+                "'ttl' of '%s' must be 'auto' or a number of seconds", subdomain
+            )
 
     # All checks passed
     return True
 
 
-def load_config(path: Path) -> Optional[Dict]:
+@functools.lru_cache(maxsize=4)
+def _load_config_cached(path: str, mtime_ns: int, size: int) -> Optional[Dict]:
+    # Keyed on the file signature so an unchanged file is only parsed and
+    # validated once. The file is read in one call and the parser works on
+    # the bytes. Returns None if the configuration is invalid.
+    data = Path(path).read_bytes()
+    if path.endswith(".json"):
+        config = orjson.loads(data) if orjson else json.loads(data)
+    elif path.endswith(".toml"):
+        config = tomllib.loads(data.decode("utf-8"))
+    else:
+        config = yaml.load(data, Loader=YAMLLoader)
+    if not validate_config(config):
+        return None
+    return normalize_config(config)
+
+
+def normalize_config(config: Dict) -> Dict:
+    """
+    Convert subdomain TTLs to the integer values sent to Cloudflare.
+
+    'auto' becomes 1, and values outside 60-86400 seconds default to 300.
     """
-    Load a configuration file in YAML format.
+    for subdomain, subdomain_config in config["subdomains"].items():
+        ttl = subdomain_config["ttl"]
+        if ttl in ("auto", 1):
+            subdomain_config["ttl"] = 1
+            continue
+
+        try:
+            ttl = int(ttl)
+        except ValueError:
+            ttl = None
+        if ttl is None or ttl < 60 or ttl > 86400:
+            logger.warning(
+                "Invalid TTL value for %s: '%s'. Defaulting to 300.",
+                subdomain,
+                subdomain_config["ttl"],
+            )
+            ttl = 300
+        subdomain_config["ttl"] = ttl
+
+    return config
+
+
+def load_config(path: Path, force: bool = False) -> Optional[Dict]:
+    """
+    Load a configuration file in YAML, JSON or TOML format.
+
+    Unless force is set, a file with the same modification time and size as
+    a previous load is not parsed again.
     """
     try:
-        with open(path, "r", encoding="utf-8") as file:
-            config = yaml.safe_load(file)
-        if validate_config(config):
-            return config
+        if force:
+            _load_config_cached.cache_clear()
+        mtime_ns, size = get_file_signature(Path(path))
+        config = _load_config_cached(str(path), mtime_ns, size)
+        if config is None:
+            # Drop the invalid result so the next load reports the reason again
+            _load_config_cached.cache_clear()
+        else:
+            # Copy so that callers never modify the cached configuration
+            return copy.deepcopy(config)
     except FileNotFoundError:
         logger.error("Configuration file not found: %s", path)
-    except yaml.YAMLError as exc:
+    except (yaml.YAMLError, ValueError) as exc:
         logger.error("Error parsing configuration file: %s", exc)
 
     return None
 
 
+def get_file_signature(path: Path) -> tuple[int, int]:
+    # Modification time and size; a cheap first check for file changes
+    stat = path.stat()
+    return stat.st_mtime_ns, stat.st_size
+
+
 def get_file_hash(path: Path):
     # Calculate the SHA-256 hash of the file content
-    hasher = hashlib.sha256()
     with open(path, "rb") as f:
-        while True:
-            chunk = f.read(4096)
-            if not chunk:
-                break
-            hasher.update(chunk)
-    return hasher.hexdigest()
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+class ConfigFileState:
+    """
+    The stat signature and content hash of the configuration file.
+
+    The content is only hashed when the modification time or size changed.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.update()
+
+    def update(self) -> None:
+        """Record the current state of the file, e.g. after loading it"""
+        self.signature = get_file_signature(self.path)
+        self.hash = get_file_hash(self.path)
+
+    def changed(self) -> bool:
+        """Check if the file content differs from the recorded state"""
+        signature = get_file_signature(self.path)
+        if signature == self.signature:
+            return False
 
+        if get_file_hash(self.path) == self.hash:
+            # Touched or rewritten without changing the content
+            self.signature = signature
+            return False
+        return True
+
+
+class ConfigChangeHandler:
+    """
+    watchdog event handler that sets reload_event when the content of the
+    configuration file changes.
+    """
+
+    def __init__(self, config_path: Path):
+        self.config_path = config_path.resolve()
+        self.state = ConfigFileState(self.config_path)
+
+    def dispatch(self, event) -> None:
+        # Called by the watchdog observer for every event in the directory
+        self.on_any_event(event)
+
+    def on_any_event(self, event) -> None:
+        paths = (event.src_path, getattr(event, "dest_path", ""))
+        if str(self.config_path) not in paths:
+            return
+
+        # A single save emits several events; only react once per change
+        try:
+            if not self.state.changed():
+                return
+            self.state.update()
+        except FileNotFoundError:
+            return
+        logger.info("Detected change in config file. Reloading...")
+        reload_event.set()
+
+
+def start_config_watcher(config_path: Path):
+    """
+    Watch the configuration file and set reload_event when it changes.
+
+    Requires the optional 'watchdog' package. Returns the started observer, or
+    None if watchdog is not installed.
+    """
+    if Observer is None:
+        return None
+
+    handler = ConfigChangeHandler(config_path)
+    observer = Observer()
+    observer.daemon = True
+    observer.schedule(handler, str(handler.config_path.parent))
+    observer.start()
+    return observer
 
-def get_own_ip() -> Optional[Dict]:
+
+def _get_own_ip_dns() -> Optional[IPInfo]:
+    # Query the CHAOS class TXT record 'whoami.cloudflare' at 1.1.1.1
+    try:
+        answer = _dns_resolver.resolve(
+            "whoami.cloudflare", "TXT", rdclass=dns.rdataclass.CH
+        )
+        ip_address = b"".join(answer[0].strings).decode("ascii")
+        # Only IPv6 addresses contain colons, so validate with that class only
+        if ":" in ip_address:
+            ipaddress.IPv6Address(ip_address)
+            return IPInfo(ip_address, "AAAA")
+        ipaddress.IPv4Address(ip_address)
+        return IPInfo(ip_address, "A")
+    except (dns.exception.DNSException, ValueError) as exc:
+        logger.debug("DNS lookup of the IP address failed: %s", exc)
+        return None
+
+
+def get_own_ip() -> Optional[IPInfo]:
     """
     Retrieve the public IP address of the current machine from 'https://1.1.1.1/cdn-cgi/trace'.
 
-    Returns a dictionary with the following keys:
+    If dnspython is installed, a single DNS query for 'whoami.cloudflare' is
+    tried first, falling back to the HTTPS request if it fails.
+
+    Returns an IPInfo with the following fields:
     - 'address': The retrieved IP address.
-    - 'type': The type of IP address ('IPv4' or 'IPv6').
+    - 'type': The DNS record type for the address ('A' or 'AAAA').
 
     Raises:
     - requests.exceptions.RequestException: If there is an error during the HTTP request.
     - ValueError: If the IP address cannot be found in the response or if there is an error parsing the response.
     """
+    if _dns_resolver:
+        ip_data = _get_own_ip_dns()
+        if ip_data:
+            return ip_data
+
     try:
-        response = requests.get("https://1.1.1.1/cdn-cgi/trace", timeout=10)
+        response = _ip_session.get("https://1.1.1.1/cdn-cgi/trace", timeout=10)
         response.raise_for_status()  # Raise an exception for bad responses
-        data = response.text.splitlines()
-        ip_address = next(
-            (line.split("=")[1] for line in data if line.startswith("ip")), None
-        )
+        match = _TRACE_IP_RE.search(response.content)
+        ip_address = match.group(1).decode("ascii") if match else None
 
         if ip_address:
-            result = {}
-            result["address"] = ip_address
-
-            # Determine IP type (IPv4 or IPv6)
-            ip_type = "A" if ipaddress.ip_address(ip_address).version == 4 else "AAAA"
-            result["type"] = ip_type
-            return result
+            # Determine IP type; only IPv6 addresses contain colons
+            return IPInfo(ip_address, "AAAA" if ":" in ip_address else "A")
         else:
             raise ValueError("IP address not found in response")
 
-    except requests.exceptions.RequestException as exc:
-        raise Exception(f"An error occurred during the request: {exc}") from exc
     except ValueError as err:
         raise ValueError(f"Error parsing response: {err}") from err
 
 
-def update_dns(config: Dict, cf_api: CloudflareAPI) -> None:
+def _plural(count: int) -> str:
+    return "" if count == 1 else "s"
+
+
+def update_dns(
+    config: Dict, cf_api: CloudflareAPI, last_ip: Optional[IPInfo] = None
+) -> Optional[IPInfo]:
     """
     Fetch current IP address and update DNS records.
 
     Args:
         config (Dict): Configuration dictionary.
+        last_ip (Optional[IPInfo]): IP data from the previous run. If the IP is
+            unchanged, Cloudflare is not contacted. Pass None to check every
+            record against Cloudflare.
+
+    Returns:
+        Optional[IPInfo]: The fetched IP data once every record is up-to-date,
+            last_ip if the IP address or the zone could not be looked up, or
+            None if any record could not be updated.
     """
-    changes_made = 0
+    updates = []
+    cf_api.clear_cache()
     logger.info("Fetching current IP address...")
-    ip_data = get_own_ip()
+    executor = None
+    if not cf_api.base_domain_name_known:
+        # Resolve the zone name, and open the API connection, while the
+        # public IP is being fetched
+        executor = ThreadPoolExecutor(max_workers=1)
+        zone_lookup = executor.submit(lambda: cf_api.base_domain_name)
+    try:
+        ip_data = get_own_ip()
+    except (requests.exceptions.RequestException, ValueError) as exc:
+        logger.warning("Failed to fetch IP address: %s", exc)
+        ip_data = None
+    if executor:
+        executor.shutdown()
+        try:
+            zone_lookup.result()
+        except (requests.exceptions.RequestException, ValueError) as exc:
+            logger.warning("Failed to fetch base domain name: %s", exc)
+            ip_data = None
     if ip_data:
         logger.info("Successfully fetched IP address: %s", ip_data)
     else:
-        logger.error("Failed to fetch IP address. Exiting...")
-        sys.exit(1)
+        logger.warning("Skipping DNS update")
+        return last_ip
 
-    subdomain_count = len(config["subdomains"])
-    logger.info(
-        "Checking %d subdomain%s...",
-        subdomain_count,
-        "s" if subdomain_count != 1 else "",
-    )
+    if ip_data == last_ip:
+        logger.info("IP unchanged, skipping Cloudflare sync")
+        return ip_data
 
-    for subdomain, settings in config["subdomains"].items():
-        proxied = settings.get("proxied")
-        ttl = settings.get("ttl")
-        if ttl in ("auto", 1):
-            ttl = 1
-        else:
-            ttl = int(ttl)
-            if ttl < 60 or ttl > 86400:
-                logger.warning(
-                    "Invalid TTL value for %s: '%s'. Defaulting to 300.", subdomain, ttl
-                )
-                ttl = 300
+    if last_ip is None:
+        # Full sync: verify every record, including ones changed elsewhere
+        cf_api.forget_known_state()
 
-        logger.info("Subdomain: %s, Proxied: %s, TTL: %s", subdomain, proxied, ttl)
+    # Snapshot of the subdomains, so the loop runs over a plain tuple
+    subdomains = tuple(config["subdomains"].items())
+    subdomain_count = len(subdomains)
+    logger.info("Checking %d subdomain%s...", subdomain_count, _plural(subdomain_count))
 
-        if cf_api.update_dns_record(subdomain, proxied, ttl, ip_data):
-            changes_made += 1
+    # Checked once so the per-subdomain log calls are skipped entirely when
+    # running at a higher log level
+    log_subdomains = logger.isEnabledFor(logging.INFO)
+    for subdomain, settings in subdomains:
+        # Both keys are guaranteed to exist by validate_config
+        proxied = settings["proxied"]
+        ttl = settings["ttl"]
+        if log_subdomains:
+            logger.info("Subdomain: %s, Proxied: %s, TTL: %s", subdomain, proxied, ttl)
 
-    if changes_made > 0:
+        updates.append((subdomain, proxied, ttl, ip_data))
+
+    result = cf_api.update_dns_records(updates)
+
+    if result.changed > 0:
         logger.info(
             "Done - %d DNS record%s updated or created.",
-            changes_made,
-            "s" if changes_made != 1 else "",
+            result.changed,
+            _plural(result.changed),
         )
-    else:
+    elif not result.failed:
         logger.info("All DNS records up-to-date. No updates necessary.")
 
+    if result.failed:
+        # Neither IP can be trusted to match the records now, so the next run
+        # checks every record, even if the IP changes back to last_ip
+        logger.warning(
+            "%d DNS record%s could not be updated, retrying next run.",
+            result.failed,
+            _plural(result.failed),
+        )
+        return None
+
+    return ip_data
+
+
+class UpdateSchedule:
+    """
+    When the interval loop runs next, and which runs are full syncs.
+
+    Runs are scheduled from the previous start, so the time spent updating
+    does not add up as drift. After an overrun, the next run is due at once.
+    """
+
+    def __init__(self, interval_seconds: int, start: float):
+        self.interval_seconds = interval_seconds
+        self.next_update = start
+        self.runs_since_full_sync = 0
+
+    def next_delay(self, now: float) -> float:
+        """Advance to the next run and return the seconds until it is due"""
+        self.next_update = max(self.next_update + self.interval_seconds, now)
+        return self.next_update - now
+
+    def restart(self, now: float) -> None:
+        """Schedule the following runs from now, e.g. after a reload"""
+        self.next_update = now
+
+    def full_sync_due(self, config_reloaded: bool) -> bool:
+        """
+        Count a run and check if it has to check every record against
+        Cloudflare: after a reload, and every FULL_SYNC_EVERY runs to correct
+        records changed elsewhere.
+        """
+        self.runs_since_full_sync += 1
+        if config_reloaded or self.runs_since_full_sync >= FULL_SYNC_EVERY:
+            self.runs_since_full_sync = 0
+            return True
+        return False
+
+
+def reconfigure_cloudflare_api(
+    cf_api: CloudflareAPI, config: Dict, new_config: Dict
+) -> CloudflareAPI:
+    """
+    Apply a reloaded configuration to the Cloudflare API client.
+
+    The existing client, with its verified token and open connections, is
+    kept unless the credentials or the zone changed.
+    """
+    if (
+        new_config["auth"] == config["auth"]
+        and new_config["zone_id"] == config["zone_id"]
+    ):
+        cf_api.update_config(new_config)
+        return cf_api
+
+    cf_api.close()  # Release the old client's connections
+    new_cf_api = init_cloudflare_api(new_config)
+    if not new_cf_api:
+        logger.error("Cloudflare API initialization failed.")
+        sys.exit(1)
+    return new_cf_api
+
 
 def main() -> None:
 
-    args = parser.parse_args()
+    args = _build_parser().parse_args()
+
+    # Configure logging, unless the embedding application already did
+    if not logging.getLogger().handlers:
+        logging.basicConfig(
+            level=logging.INFO, format="%(asctime)s | %(levelname)s | %(message)s"
+        )
 
     # Setup signal handlers
     signal_catch_setup()
@@ -272,37 +671,64 @@ def main() -> None:
         sys.exit(1)
 
     # Run the DNS update once
-    update_dns(config, cf_api)
+    started = time.monotonic()
+    last_ip = update_dns(config, cf_api)
+    if not interval_seconds and last_ip is None:
+        sys.exit(1)
 
-    # Initial hash of config file
-    initial_hash = get_file_hash(config_path)
+    # Initial signature and hash of config file
+    config_state = ConfigFileState(config_path)
 
     # If interval is set, continue running at specified intervals
     if interval_seconds:
+        schedule = UpdateSchedule(interval_seconds, started)
+        # Changes are still detected at each iteration without a watcher
+        watcher = start_config_watcher(config_path)
+        if watcher:
+            logger.info("Watching config file for changes")
         while True:
-            logger.info("Sleeping for %d seconds...", interval_seconds)
-            time.sleep(interval_seconds)
+            delay = schedule.next_delay(time.monotonic())
+            logger.info("Sleeping for %d seconds...", round(delay))
+            # Returns early when a reload is requested with SIGHUP or by the
+            # config file watcher
+            reload_requested = reload_event.wait(delay)
+            reload_event.clear()
+            if shutdown_event.is_set():
+                break
+            if reload_requested:
+                # Restart the schedule from the reload
+                schedule.restart(time.monotonic())
+            config_reloaded = False
 
             # Check if config file has changed
-            current_hash = get_file_hash(config_path)
-            if current_hash != initial_hash:
-                logger.info("Detected change in config file. Reloading...")
-                new_config = load_config(config_path)
+            if reload_requested or config_state.changed():
+                if not reload_requested:
+                    logger.info("Detected change in config file. Reloading...")
+                # SIGHUP bypasses the cache, in case the file changed without
+                # changing its size within the modification time granularity
+                new_config = load_config(config_path, force=reload_requested)
                 if new_config:
+                    cf_api = reconfigure_cloudflare_api(cf_api, config, new_config)
                     config = new_config
-                    cf_api = init_cloudflare_api(config)  # Reinitialize API client
-                    if not cf_api:
-                        logger.error("Cloudflare API initialization failed.")
-                        sys.exit(1)
-                    initial_hash = current_hash
+                    config_state.update()
+                    config_reloaded = True
                     logger.info("Configuration reloaded successfully")
                 else:
                     logger.warning(
                         "Failed to reload configuration. Continuing with current config."
                     )
 
-            # Update DNS
-            update_dns(config, cf_api)
+            # Update DNS. Skipped while the IP is unchanged, except after a
+            # reload and periodically to correct records changed elsewhere.
+            full_sync = schedule.full_sync_due(config_reloaded)
+            last_ip = update_dns(config, cf_api, None if full_sync else last_ip)
+
+        if watcher:
+            watcher.stop()
+
+    # Close the pooled connections before exiting
+    cf_api.close()
+    _ip_session.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,264 @@
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+import requests
+from cfddns.cloudflare.api import CloudflareAPI, IPInfo, UpdateResult
+
+CONFIG = {"auth": {"api_token": "valid_token"}, "zone_id": "my_zone_id"}
+IP_DATA = IPInfo("203.0.113.10", "A")
+
+
+def make_record(name, content="198.51.100.1", proxied=False, ttl=300):
+    return {
+        "id": f"id-{name}",
+        "type": "A",
+        "name": name,
+        "content": content,
+        "proxied": proxied,
+        "ttl": ttl,
+    }
+
+
+def make_api():
+    cf_api = CloudflareAPI("https://api.example.com", CONFIG)
+    cf_api.session = MagicMock()
+    return cf_api
+
+
+def set_records(cf_api, *records):
+    response = cf_api.session.get.return_value
+    response.json.return_value = {"result": list(records)}
+    response.content = json.dumps({"result": list(records)}).encode()
+
+
+def sent_json(call):
+    if "json" in call.kwargs:
+        return call.kwargs["json"]
+    return json.loads(call.kwargs["data"])
+
+
+class TestLazyInitialization(unittest.TestCase):
+
+    def setUp(self):
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        env = patch.dict(os.environ, {"XDG_CACHE_HOME": cache_dir.name})
+        env.start()
+        self.addCleanup(env.stop)
+
+    def set_zone(self, cf_api):
+        response = cf_api.session.get.return_value
+        response.json.return_value = {"result": {"name": "example.com"}}
+        response.content = b'{"result": {"name": "example.com"}}'
+
+    def test_no_requests_on_init(self):
+        cf_api = make_api()
+
+        cf_api.session.get.assert_not_called()
+        self.assertIsNone(cf_api.token_valid)
+
+    def test_base_domain_fetched_once(self):
+        cf_api = make_api()
+        self.set_zone(cf_api)
+
+        self.assertEqual(cf_api.base_domain_name, "example.com")
+        self.assertEqual(cf_api.base_domain_name, "example.com")
+
+        cf_api.session.get.assert_called_once()
+        self.assertTrue(cf_api.token_valid)
+
+    def test_base_domain_cached_across_clients(self):
+        first = make_api()
+        self.set_zone(first)
+        self.assertEqual(first.base_domain_name, "example.com")
+
+        second = make_api()
+
+        self.assertEqual(second.base_domain_name, "example.com")
+        second.session.get.assert_not_called()
+
+    def test_zone_looked_up_again_after_404(self):
+        cf_api = make_api()
+        self.set_zone(cf_api)
+        self.assertEqual(cf_api.base_domain_name, "example.com")
+        cf_api.session.get.return_value.raise_for_status.side_effect = (
+            requests.HTTPError("not found", response=MagicMock(status_code=404))
+        )
+
+        self.assertIsNone(cf_api.get_dns_records("A"))
+
+        self.assertFalse(cf_api.base_domain_name_known)
+        self.assertFalse(
+            (
+                Path(os.environ["XDG_CACHE_HOME"]) / "cfddns/zone_my_zone_id.name"
+            ).exists()
+        )
+
+    def test_failed_lookup_raises(self):
+        cf_api = make_api()
+        cf_api.session.get.side_effect = requests.ConnectionError("network down")
+
+        with self.assertRaises(requests.ConnectionError):
+            cf_api.base_domain_name
+        self.assertFalse(cf_api.base_domain_name_known)
+
+    def test_no_home_directory(self):
+        # The cache is disabled when there is nowhere to keep it
+        with patch.dict(os.environ, {"XDG_CACHE_HOME": ""}), patch(
+            "pathlib.Path.home", side_effect=RuntimeError("no home")
+        ):
+            cf_api = make_api()
+            self.set_zone(cf_api)
+
+            self.assertEqual(cf_api.base_domain_name, "example.com")
+
+
+class TestGetFqdn(unittest.TestCase):
+
+    def test_subdomain_formats(self):
+        cases = {
+            "example.com": "example.com",
+            "WWW.example.com ": "www.example.com",
+            "www": "www.example.com",
+            "a.b": "a.b.example.com",
+        }
+        for subdomain, fqdn in cases.items():
+            self.assertEqual(CloudflareAPI._get_fqdn(subdomain, "example.com"), fqdn)
+
+
+class TestUpdateDnsRecords(unittest.TestCase):
+
+    def setUp(self):
+        self.cf_api = make_api()
+        self.cf_api._base_domain_name = "example.com"
+
+    def test_single_batch_request(self):
+        set_records(self.cf_api, make_record("a.example.com"))
+
+        result = self.cf_api.update_dns_records(
+            [("a", False, 300, IP_DATA), ("b", True, 1, IP_DATA)]
+        )
+
+        self.assertEqual(result, UpdateResult(2, 0))
+        self.cf_api.session.get.assert_called_once()
+        self.cf_api.session.post.assert_called_once()
+        url = self.cf_api.session.post.call_args.args[0]
+        payload = sent_json(self.cf_api.session.post.call_args)
+        self.assertTrue(url.endswith("/zones/my_zone_id/dns_records/batch"))
+        self.assertEqual([p["id"] for p in payload["patches"]], ["id-a.example.com"])
+        self.assertEqual([p["name"] for p in payload["posts"]], ["b.example.com"])
+        # Patches only carry the fields that changed
+        self.assertEqual(payload["patches"][0]["content"], IP_DATA.address)
+        self.assertNotIn("proxied", payload["patches"][0])
+        self.assertNotIn("ttl", payload["patches"][0])
+
+    def test_falls_back_to_single_requests(self):
+        set_records(self.cf_api, make_record("a.example.com"))
+
+        def post(url, **kwargs):
+            response = MagicMock()
+            if url.endswith("/batch"):
+                response.raise_for_status.side_effect = requests.HTTPError(
+                    "rejected", response=MagicMock(status_code=400)
+                )
+            return response
+
+        self.cf_api.session.post.side_effect = post
+
+        result = self.cf_api.update_dns_records(
+            [("a", False, 300, IP_DATA), ("b", True, 1, IP_DATA)]
+        )
+
+        self.assertEqual(result, UpdateResult(2, 0))
+        self.cf_api.session.patch.assert_called_once()
+        self.assertTrue(
+            self.cf_api.session.patch.call_args.args[0].endswith("/id-a.example.com")
+        )
+        self.assertEqual(self.cf_api.session.post.call_count, 2)
+
+    def test_failed_records_are_reported(self):
+        set_records(self.cf_api, make_record("a.example.com"))
+        rejected = requests.HTTPError("rejected", response=MagicMock(status_code=400))
+        self.cf_api.session.post.return_value.raise_for_status.side_effect = rejected
+        self.cf_api.session.patch.return_value.raise_for_status.side_effect = rejected
+
+        result = self.cf_api.update_dns_records([("a", False, 300, IP_DATA)])
+
+        self.assertEqual(result, UpdateResult(0, 1))
+        # The failed record is not remembered as current
+        self.assertFalse(
+            self.cf_api._is_known_current("a.example.com", False, 300, IP_DATA)
+        )
+
+    def test_no_fallback_without_response(self):
+        set_records(self.cf_api, make_record("a.example.com"))
+        self.cf_api.session.post.side_effect = requests.ConnectionError("timeout")
+
+        result = self.cf_api.update_dns_records([("a", False, 300, IP_DATA)])
+
+        self.assertEqual(result, UpdateResult(0, 1))
+        self.cf_api.session.post.assert_called_once()
+        self.cf_api.session.patch.assert_not_called()
+
+    def test_no_fallback_when_rate_limited(self):
+        set_records(self.cf_api, make_record("a.example.com"))
+        response = self.cf_api.session.post.return_value
+        response.raise_for_status.side_effect = requests.HTTPError(
+            "rate limited", response=MagicMock(status_code=429)
+        )
+
+        result = self.cf_api.update_dns_records([("a", False, 300, IP_DATA)])
+
+        self.assertEqual(result, UpdateResult(0, 1))
+        self.cf_api.session.patch.assert_not_called()
+
+    def test_up_to_date_records_send_nothing(self):
+        set_records(self.cf_api, make_record("a.example.com", content=IP_DATA.address))
+
+        result = self.cf_api.update_dns_records([("a", False, 300, IP_DATA)])
+
+        self.assertEqual(result, UpdateResult(0, 0))
+        self.cf_api.session.post.assert_not_called()
+
+    def test_unchanged_records_skip_api(self):
+        set_records(self.cf_api, make_record("a.example.com"))
+        self.cf_api.update_dns_records([("a", False, 300, IP_DATA)])
+        self.cf_api.clear_cache()
+        self.cf_api.session.reset_mock()
+
+        result = self.cf_api.update_dns_records([("a", False, 300, IP_DATA)])
+
+        self.assertEqual(result, UpdateResult(0, 0))
+        self.cf_api.session.get.assert_not_called()
+        self.cf_api.session.post.assert_not_called()
+
+
+class TestDnsRecordsCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cf_api = make_api()
+        self.cf_api._base_domain_name = "example.com"
+        set_records(
+            self.cf_api,
+            make_record("a.example.com", content=IP_DATA.address),
+            make_record("c.example.com", content=IP_DATA.address),
+        )
+
+    def test_records_fetched_once_per_type(self):
+        self.cf_api.update_dns_record("a", False, 300, IP_DATA)
+        self.cf_api.update_dns_record("c", False, 300, IP_DATA)
+
+        self.cf_api.session.get.assert_called_once()
+
+    def test_cache_invalidated_after_write(self):
+        self.cf_api.update_dns_record("b", False, 300, IP_DATA)
+        self.cf_api.update_dns_record("a", True, 1, IP_DATA)
+
+        self.assertEqual(self.cf_api.session.get.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from cfddns.main import ConfigChangeHandler, reload_event
+
+
+class TestConfigChangeHandler(unittest.TestCase):
+
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.config_path = Path(temp_dir.name).resolve() / "config.yaml"
+        self.config_path.write_text("zone_id: a\n")
+        self.handler = ConfigChangeHandler(self.config_path)
+        reload_event.clear()
+        self.addCleanup(reload_event.clear)
+
+    def modified(self, path):
+        return SimpleNamespace(event_type="modified", src_path=str(path))
+
+    def test_content_change(self):
+        self.config_path.write_text("zone_id: bb\n")
+
+        self.handler.on_any_event(self.modified(self.config_path))
+        self.assertTrue(reload_event.is_set())
+
+        # Further events for the same change do not trigger another reload
+        reload_event.clear()
+        self.handler.on_any_event(self.modified(self.config_path))
+        self.assertFalse(reload_event.is_set())
+
+    def test_touch(self):
+        mtime_ns = self.config_path.stat().st_mtime_ns + 10**9
+        os.utime(self.config_path, ns=(mtime_ns, mtime_ns))
+
+        self.handler.on_any_event(self.modified(self.config_path))
+
+        self.assertFalse(reload_event.is_set())
+
+    def test_other_file(self):
+        self.config_path.write_text("zone_id: bb\n")
+
+        self.handler.on_any_event(self.modified(self.config_path.with_name("other")))
+
+        self.assertFalse(reload_event.is_set())
+
+
+if __name__ == "__main__":
+    unittest.main()
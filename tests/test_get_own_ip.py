@@ -0,0 +1,51 @@
+import unittest
+from unittest.mock import MagicMock, patch
+from cfddns import main
+from cfddns.main import get_own_ip
+
+TRACE = b"fl=123abc\nh=1.1.1.1\nip=%s\nts=1700000000.123\nvisit_scheme=https\n"
+
+
+class TestGetOwnIp(unittest.TestCase):
+
+    def get_ip(self, content):
+        with patch("cfddns.main._dns_resolver", None), patch(
+            "cfddns.main._ip_session"
+        ) as session:
+            session.get.return_value.content = content
+            return get_own_ip()
+
+    def test_ipv4(self):
+        ip_data = self.get_ip(TRACE % b"203.0.113.10")
+        self.assertEqual(ip_data.address, "203.0.113.10")
+        self.assertEqual(ip_data.type, "A")
+
+    def test_ipv6(self):
+        ip_data = self.get_ip(TRACE % b"2001:db8::1")
+        self.assertEqual(ip_data.address, "2001:db8::1")
+        self.assertEqual(ip_data.type, "AAAA")
+
+    def test_missing_ip(self):
+        with self.assertRaises(ValueError):
+            self.get_ip(b"fl=123abc\nh=1.1.1.1\n")
+
+    def test_malformed_ip(self):
+        with self.assertRaises(ValueError):
+            self.get_ip(TRACE % b"<html>")
+
+    @unittest.skipIf(main.dns is None, "dnspython is not installed")
+    def test_dns_lookup(self):
+        resolver = MagicMock()
+        resolver.resolve.return_value = [MagicMock(strings=(b"2001:db8::1",))]
+        with patch("cfddns.main._dns_resolver", resolver), patch(
+            "cfddns.main._ip_session"
+        ) as session:
+            ip_data = get_own_ip()
+
+        self.assertEqual(ip_data.address, "2001:db8::1")
+        self.assertEqual(ip_data.type, "AAAA")
+        session.get.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import copy
+import unittest
+from unittest.mock import MagicMock, patch
+from cfddns.main import reconfigure_cloudflare_api
+
+CONFIG = {
+    "auth": {"api_token": "valid_token"},
+    "zone_id": "my_zone_id",
+    "subdomains": {"www": {"proxied": True, "ttl": 1}},
+}
+
+
+class TestReconfigureCloudflareApi(unittest.TestCase):
+
+    def setUp(self):
+        self.cf_api = MagicMock()
+        self.new_config = copy.deepcopy(CONFIG)
+
+    def test_subdomains_changed_keeps_client(self):
+        self.new_config["subdomains"]["api"] = {"proxied": False, "ttl": 300}
+
+        with patch("cfddns.main.init_cloudflare_api") as init:
+            cf_api = reconfigure_cloudflare_api(self.cf_api, CONFIG, self.new_config)
+
+        self.assertIs(cf_api, self.cf_api)
+        self.cf_api.update_config.assert_called_once_with(self.new_config)
+        self.cf_api.close.assert_not_called()
+        init.assert_not_called()
+
+    def test_credentials_or_zone_changed_replaces_client(self):
+        changes = {
+            "auth": {"api_token": "other_token"},
+            "zone_id": "other_zone_id",
+        }
+        for key, value in changes.items():
+            with self.subTest(key=key):
+                cf_api = MagicMock()
+                new_config = dict(self.new_config, **{key: value})
+
+                with patch("cfddns.main.init_cloudflare_api") as init:
+                    result = reconfigure_cloudflare_api(cf_api, CONFIG, new_config)
+
+                cf_api.close.assert_called_once()
+                init.assert_called_once_with(new_config)
+                self.assertIs(result, init.return_value)
+
+
+if __name__ == "__main__":
+    unittest.main()
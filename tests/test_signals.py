@@ -0,0 +1,45 @@
+import os
+import signal
+import unittest
+from cfddns.main import handle_signal, reload_event, shutdown_event, signal_catch_setup
+
+
+class TestHandleSignal(unittest.TestCase):
+
+    def setUp(self):
+        for event in (reload_event, shutdown_event):
+            event.clear()
+            self.addCleanup(event.clear)
+
+    @unittest.skipUnless(hasattr(signal, "SIGHUP"), "SIGHUP is not available")
+    def test_sighup_requests_reload(self):
+        handle_signal(signal.SIGHUP)
+
+        self.assertTrue(reload_event.is_set())
+        self.assertFalse(shutdown_event.is_set())
+
+    def test_sigterm_requests_shutdown(self):
+        handle_signal(signal.SIGTERM)
+
+        self.assertTrue(shutdown_event.is_set())
+        self.assertTrue(reload_event.is_set())
+
+    @unittest.skipUnless(hasattr(signal, "SIGHUP"), "SIGHUP is not available")
+    def test_signal_delivered_through_wakeup_socket(self):
+        handlers = {
+            signum: signal.getsignal(signum)
+            for signum in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP)
+        }
+        signal_catch_setup()
+        self.addCleanup(signal.set_wakeup_fd, -1)
+        for signum, handler in handlers.items():
+            self.addCleanup(signal.signal, signum, handler)
+
+        os.kill(os.getpid(), signal.SIGHUP)
+
+        self.assertTrue(reload_event.wait(5))
+        self.assertFalse(shutdown_event.is_set())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import unittest
+from unittest.mock import MagicMock, PropertyMock, patch
+import requests
+from cfddns.cloudflare import IPInfo, UpdateResult
+from cfddns.main import update_dns
+
+CONFIG = {"subdomains": {"www": {"proxied": True, "ttl": 1}}}
+IP_DATA = IPInfo("203.0.113.10", "A")
+
+
+class TestUpdateDns(unittest.TestCase):
+
+    def setUp(self):
+        self.cf_api = MagicMock()
+        self.cf_api.update_dns_records.return_value = UpdateResult(0, 0)
+        get_own_ip = patch("cfddns.main.get_own_ip", return_value=IP_DATA)
+        self.get_own_ip = get_own_ip.start()
+        self.addCleanup(get_own_ip.stop)
+
+    def test_full_sync(self):
+        self.assertEqual(update_dns(CONFIG, self.cf_api), IP_DATA)
+
+        self.cf_api.forget_known_state.assert_called_once()
+        self.cf_api.update_dns_records.assert_called_once_with(
+            [("www", True, 1, IP_DATA)]
+        )
+
+    def test_unchanged_ip_skips_cloudflare(self):
+        update_dns(CONFIG, self.cf_api, last_ip=IP_DATA)
+
+        self.cf_api.update_dns_records.assert_not_called()
+
+    def test_changed_ip_updates_records(self):
+        update_dns(CONFIG, self.cf_api, last_ip=IPInfo("192.0.2.1", "A"))
+
+        self.cf_api.forget_known_state.assert_not_called()
+        self.cf_api.update_dns_records.assert_called_once()
+
+    def test_failed_ip_lookup_keeps_last_ip(self):
+        self.get_own_ip.side_effect = requests.ConnectionError("unreachable")
+        last_ip = IPInfo("192.0.2.1", "A")
+
+        self.assertEqual(update_dns(CONFIG, self.cf_api, last_ip=last_ip), last_ip)
+
+        self.cf_api.update_dns_records.assert_not_called()
+
+    def test_failed_update_forces_full_sync(self):
+        self.cf_api.update_dns_records.return_value = UpdateResult(0, 1)
+
+        self.assertIsNone(
+            update_dns(CONFIG, self.cf_api, last_ip=IPInfo("192.0.2.1", "A"))
+        )
+
+    def test_ip_reverted_after_failed_update(self):
+        old_ip = IPInfo("192.0.2.1", "A")
+        # The IP changes and only some records are updated
+        self.cf_api.update_dns_records.return_value = UpdateResult(1, 1)
+        last_ip = update_dns(CONFIG, self.cf_api, last_ip=old_ip)
+
+        # Then the IP changes back
+        self.get_own_ip.return_value = old_ip
+        self.cf_api.update_dns_records.return_value = UpdateResult(1, 0)
+        self.assertEqual(update_dns(CONFIG, self.cf_api, last_ip=last_ip), old_ip)
+
+        self.assertEqual(self.cf_api.update_dns_records.call_count, 2)
+        self.cf_api.forget_known_state.assert_called_once()
+
+    def test_failed_zone_lookup_keeps_last_ip(self):
+        self.cf_api.base_domain_name_known = False
+        type(self.cf_api).base_domain_name = PropertyMock(
+            side_effect=requests.ConnectionError("network down")
+        )
+        last_ip = IPInfo("192.0.2.1", "A")
+
+        self.assertEqual(update_dns(CONFIG, self.cf_api, last_ip=last_ip), last_ip)
+
+        self.cf_api.update_dns_records.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
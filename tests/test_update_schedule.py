@@ -0,0 +1,50 @@
+import unittest
+from cfddns.main import FULL_SYNC_EVERY, UpdateSchedule
+
+
+class TestUpdateSchedule(unittest.TestCase):
+
+    def test_no_drift(self):
+        schedule = UpdateSchedule(60, start=1000.0)
+
+        # The update took 5 seconds, which is taken off the next sleep
+        self.assertEqual(schedule.next_delay(now=1005.0), 55.0)
+        self.assertEqual(schedule.next_delay(now=1062.0), 58.0)
+
+    def test_overrun_runs_at_once(self):
+        schedule = UpdateSchedule(60, start=1000.0)
+
+        self.assertEqual(schedule.next_delay(now=1090.0), 0)
+        # The schedule continues from the late run
+        self.assertEqual(schedule.next_delay(now=1100.0), 50.0)
+
+    def test_restart(self):
+        schedule = UpdateSchedule(60, start=1000.0)
+        schedule.next_delay(now=1010.0)
+
+        schedule.restart(now=1020.0)
+
+        self.assertEqual(schedule.next_delay(now=1021.0), 59.0)
+
+    def test_periodic_full_sync(self):
+        schedule = UpdateSchedule(60, start=0.0)
+
+        due = [schedule.full_sync_due(False) for _ in range(2 * FULL_SYNC_EVERY)]
+
+        self.assertEqual(due.count(True), 2)
+        self.assertTrue(due[FULL_SYNC_EVERY - 1])
+        self.assertTrue(due[-1])
+
+    def test_full_sync_after_reload(self):
+        schedule = UpdateSchedule(60, start=0.0)
+        schedule.full_sync_due(False)
+
+        self.assertTrue(schedule.full_sync_due(True))
+        # The periodic count starts over after the reload
+        due = [schedule.full_sync_due(False) for _ in range(FULL_SYNC_EVERY)]
+        self.assertEqual(due.count(True), 1)
+        self.assertTrue(due[-1])
+
+
+if __name__ == "__main__":
+    unittest.main()
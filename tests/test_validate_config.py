@@ -1,6 +1,8 @@
+import os
+import tempfile
 import unittest
 from pathlib import Path
-from cfddns.main import validate_config, load_config
+from cfddns.main import validate_config, load_config, normalize_config
 
 
 class TestValidateConfig(unittest.TestCase):
@@ -19,6 +21,79 @@ class TestValidateConfig(unittest.TestCase):
         # Assert that the configuration is None
         self.assertIsNone(load_config(self.invalid_config_path))
 
+    def test_invalid_config_reported_on_every_load(self):
+        # Invalid results are not cached, so each load logs the reason again
+        with self.assertLogs("cfddns.main", level="WARNING") as logs:
+            load_config(self.invalid_config_path)
+            load_config(self.invalid_config_path)
+        self.assertEqual(len(logs.output), 2)
+
+    def test_invalid_config_reason_logged(self):
+        with self.assertLogs("cfddns.main", level="WARNING") as logs:
+            self.assertFalse(validate_config({"auth": {}}))
+        self.assertIn("'api_token' or 'api_key'", logs.output[0])
+
+    def test_empty_config(self):
+        self.assertFalse(validate_config(None))
+
+    def test_invalid_subdomain_name(self):
+        config = load_config(self.valid_config_path)
+        config["subdomains"]["bad name!"] = {"proxied": False, "ttl": 300}
+        self.assertFalse(validate_config(config))
+
+    def test_load_config_returns_independent_copies(self):
+        # Modifying a loaded configuration must not leak into the next load
+        config = load_config(self.valid_config_path)
+        config["subdomains"].clear()
+        self.assertTrue(load_config(self.valid_config_path)["subdomains"])
+
+    def test_forced_load_bypasses_cache(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "config.yaml"
+            path.write_text(self.valid_config_path.read_text())
+            load_config(path)
+
+            # Same size and modification time, different content
+            stat = path.stat()
+            path.write_text(path.read_text().replace("my_zone_id", "my_zone_xx"))
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+            self.assertEqual(load_config(path)["zone_id"], "my_zone_id")
+            self.assertEqual(load_config(path, force=True)["zone_id"], "my_zone_xx")
+
+    def test_load_json_config(self):
+        # A JSON file with the same content yields the same configuration
+        self.assertEqual(
+            load_config(self.test_dir / "valid.json"),
+            load_config(self.valid_config_path),
+        )
+
+    def test_load_toml_config(self):
+        self.assertEqual(
+            load_config(self.test_dir / "valid.toml"),
+            load_config(self.valid_config_path),
+        )
+
+
+class TestNormalizeConfig(unittest.TestCase):
+
+    def test_ttl_values(self):
+        config = {
+            "subdomains": {
+                "auto": {"proxied": True, "ttl": "auto"},
+                "numeric": {"proxied": False, "ttl": "600"},
+                "too_low": {"proxied": False, "ttl": 10},
+                "invalid": {"proxied": False, "ttl": "soon"},
+            }
+        }
+
+        normalize_config(config)
+
+        ttls = {name: sub["ttl"] for name, sub in config["subdomains"].items()}
+        self.assertEqual(
+            ttls, {"auto": 1, "numeric": 600, "too_low": 300, "invalid": 300}
+        )
+
 
 if __name__ == "__main__":
     unittest.main()